@@ -4,12 +4,27 @@ Example 1: Basic Range Calculation
 ===================================
 
 Demonstrates the simplest use case: calculating highway range for a typical EV.
+
+Run from the repository root:
+    python -m examples.basic_range_calculation
+or as a script from any directory:
+    python examples/basic_range_calculation.py
 """
 
+import os
 import sys
-sys.path.insert(0, '../src')
 
-from ev_calculator import *
+# Make the repository root importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ev_calculator import (
+    VehicleParameters,
+    BatteryParameters,
+    PowertrainParameters,
+    AuxiliaryLoads,
+    EnergyCalculator,
+    DriveCycle,
+)
 
 
 def main():
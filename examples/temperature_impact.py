@@ -4,14 +4,23 @@ Example 2: Temperature Impact on Range
 ======================================
 
 Demonstrates how temperature affects EV range (winter vs summer).
+
+Run from the repository root:
+    python -m examples.temperature_impact
+or as a script from any directory:
+    python examples/temperature_impact.py
 """
 
+import os
 import sys
-sys.path.insert(0, '../src')
 
-from ev_calculator import *
 import numpy as np
 
+# Make the repository root importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ev_calculator import EnergyCalculator, EVVisualizer
+
 
 def main():
     """Analyze temperature impact on EV range."""
@@ -23,13 +32,6 @@ def main():
     # Base range from EPA/WLTP rating
     base_range = 400  # km
 
-    # Create calculator
-    vehicle = VehicleParameters()
-    battery = BatteryParameters()
-    powertrain = PowertrainParameters()
-    aux = AuxiliaryLoads()
-    calc = EnergyCalculator(vehicle, powertrain, battery, aux)
-
     # Test different temperatures
     temperatures = [-20, -10, 0, 10, 20, 25, 30, 40]
 
@@ -38,22 +40,23 @@ def main():
     print(f"{'Temperature':<15} {'Range':<12} {'Loss':<12} {'Factors'}")
     print("-"*70)
 
-    for temp in temperatures:
-        result = calc.predict_range_with_adjustments(
-            base_range,
-            temperature=temp,
-            terrain_factor=1.0,
-            traffic_factor=1.0
-        )
+    # Evaluate all temperatures in one vectorized call; range adjustment is
+    # a static method, so no vehicle model has to be built
+    sweep = EnergyCalculator.predict_range_with_adjustments(
+        base_range, temperature=temperatures, terrain_factor=1.0, traffic_factor=1.0)
 
-        print(f"{temp:>6}°C        {result['adjusted_range_km']:<12.0f} "
-              f"{result['range_loss_percent']:<12.1f} "
-              f"(t:{result['f_temp']:.2f} h:{result['f_hvac']:.2f})")
+    # Format the whole table first and write it out in one call
+    lines = []
+    for i, temp in enumerate(temperatures):
+        lines.append(f"{temp:>6}°C        {sweep['adjusted_range_km'][i]:<12.0f} "
+                     f"{sweep['range_loss_percent'][i]:<12.1f} "
+                     f"(t:{sweep['f_temp'][i]:.2f} h:{sweep['f_hvac'][i]:.2f})")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     print("="*70)
 
     # Highlight winter impact
-    winter_result = calc.predict_range_with_adjustments(base_range, temperature=-10)
+    winter_result = EnergyCalculator.predict_range_with_adjustments(base_range, temperature=-10)
     print(f"\n⚠️  WINTER IMPACT (-10°C):")
     print(f"   Range loss: {winter_result['range_loss_percent']:.0f}%")
     print(f"   Usable range: {winter_result['adjusted_range_km']:.0f} km")
@@ -4,12 +4,20 @@ Example 4: Model Validation
 ===========================
 
 Demonstrates validation against real vehicle data (Nissan Leaf 2018).
+
+Run from the repository root:
+    python -m examples.validation_demo
+or as a script from any directory:
+    python examples/validation_demo.py
 """
 
+import os
 import sys
-sys.path.insert(0, '../src')
 
-from ev_calculator import *
+# Make the repository root importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ev_calculator import ModelValidator
 
 
 def main():
@@ -24,34 +32,27 @@ def main():
     validator = ModelValidator()
     results = validator.validate_nissan_leaf_2018()
 
-    # Display results
-    print("\n" + "="*70)
-    print(f"Vehicle: {results['vehicle']}")
-    print("="*70)
-    print(f"\n{'Metric':<25} {'EPA Data':<15} {'Model':<15} {'Error'}")
-    print("-"*70)
-
-    print(f"{'City Energy':<25} {results['city']['epa']:<15.1f} "
-          f"{results['city']['model']:<15.1f} {results['city']['error_percent']:>+7.2f}%")
-
-    print(f"{'  [kWh/100km]':<25}")
-
-    print(f"\n{'Highway Energy':<25} {results['highway']['epa']:<15.1f} "
-          f"{results['highway']['model']:<15.1f} {results['highway']['error_percent']:>+7.2f}%")
-
-    print(f"{'  [kWh/100km]':<25}")
-
-    print(f"\n{'Combined Energy':<25} {results['combined']['epa']:<15.1f} "
-          f"{results['combined']['model']:<15.1f} {results['combined']['error_percent']:>+7.2f}%")
-
-    print(f"{'  [kWh/100km]':<25}")
-
-    print(f"\n{'Range':<25} {results['range']['epa']:<15.0f} "
-          f"{results['range']['model']:<15.0f} {results['range']['error_percent']:>+7.2f}%")
-
-    print(f"{'  [km]':<25}")
-
-    print("\n" + "="*70)
+    # Display results: build the table, then write it out in one call
+    lines = [
+        "\n" + "="*70,
+        f"Vehicle: {results['vehicle']}",
+        "="*70,
+        f"\n{'Metric':<25} {'EPA Data':<15} {'Model':<15} {'Error'}",
+        "-"*70,
+    ]
+
+    for label, key, unit, fmt in [('City Energy', 'city', '[kWh/100km]', '.1f'),
+                                  ('Highway Energy', 'highway', '[kWh/100km]', '.1f'),
+                                  ('Combined Energy', 'combined', '[kWh/100km]', '.1f'),
+                                  ('Range', 'range', '[km]', '.0f')]:
+        row = results[key]
+        prefix = "" if key == 'city' else "\n"
+        lines.append(f"{prefix}{label:<25} {row['epa']:<15{fmt}} "
+                     f"{row['model']:<15{fmt}} {row['error_percent']:>+7.2f}%")
+        lines.append(f"{'  ' + unit:<25}")
+
+    lines.append("\n" + "="*70)
+    sys.stdout.write("\n".join(lines) + "\n")
 
     # Assessment
     max_error = max(
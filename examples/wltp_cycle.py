@@ -4,12 +4,28 @@ Example 3: WLTP Drive Cycle Simulation
 ======================================
 
 Demonstrates full drive cycle simulation with visualization.
+
+Run from the repository root:
+    python -m examples.wltp_cycle
+or as a script from any directory:
+    python examples/wltp_cycle.py
 """
 
+import os
 import sys
-sys.path.insert(0, '../src')
 
-from ev_calculator import *
+# Make the repository root importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ev_calculator import (
+    VehicleParameters,
+    BatteryParameters,
+    PowertrainParameters,
+    AuxiliaryLoads,
+    EnergyCalculator,
+    DriveCycle,
+    EVVisualizer,
+)
 
 
 def main():
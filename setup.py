@@ -0,0 +1,35 @@
+"""
+Build script for the optional Cython extension (src/ev_calculator_ext.pyx).
+
+ev_calculator works without it; when the extension is built, VehicleDynamics
+uses the compiled total_tractive_force / tractive_power kernels.
+
+Usage (from the repository root, requires Cython and a C compiler):
+    python setup.py build_ext --inplace
+
+-march=native tunes the binary for the build machine; drop it when building
+wheels that are meant to run elsewhere.
+"""
+
+import sys
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+if sys.platform == "win32":
+    extra_compile_args = ["/O2", "/fp:fast"]
+else:
+    extra_compile_args = ["-O3", "-march=native", "-ffast-math"]
+
+extensions = [
+    Extension(
+        "src.ev_calculator_ext",
+        ["src/ev_calculator_ext.pyx"],
+        extra_compile_args=extra_compile_args,
+    ),
+]
+
+setup(
+    name="ev-calculator-ext",
+    ext_modules=cythonize(extensions, language_level=3),
+)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time build of the Numba drive-cycle kernel
+===================================================
+
+Compiles the fused drive-cycle kernel of ev_calculator (_run_cycle) into a
+native extension module (src/ev_kernels.*.so / .pyd) with numba.pycc, so
+that neither JIT compilation on first call nor Numba itself is needed at run
+time. ev_calculator imports the extension when it is present and otherwise
+uses the JIT kernel (or the NumPy fallback when Numba is not installed).
+
+Run once per platform / Python version, e.g. when building a wheel:
+    python -m src.build_aot
+
+Requires Numba (and a C compiler) at build time only.
+"""
+
+import os
+
+from numba import from_dtype, types
+from numba.pycc import CC
+
+from src.ev_calculator import _PARAMS_DTYPE, _run_cycle
+
+
+def build(output_dir: str = os.path.dirname(os.path.abspath(__file__))) -> None:
+    """
+    Compile the ev_kernels extension module into output_dir.
+
+    Args:
+        output_dir: Directory for the compiled module (default: src/)
+    """
+    cc = CC('ev_kernels')
+    cc.output_dir = output_dir
+
+    f8 = types.float64
+    # Inputs typed read-only so the memoized, read-only DriveCycle arrays
+    # are accepted as well as ordinary arrays
+    vec = types.Array(types.float64, 1, "C", readonly=True)
+    buf = types.float64[::1]
+    series = types.UniTuple(buf, 3)
+
+    # Same Python source as the JIT kernel, compiled for the concrete types
+    # EnergyCalculator passes in
+    cc.export('run_cycle', types.UniTuple(f8, 6)(
+        vec, vec, f8, from_dtype(_PARAMS_DTYPE), series))(_run_cycle.py_func)
+
+    cc.compile()
+
+
+if __name__ == "__main__":
+    build()
@@ -30,28 +30,303 @@ Author: Based on math-model-ref repository
 Date: 2025-01-08
 """
 
+import argparse
 import os
 import sys
 import warnings
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from operator import attrgetter
 from typing import Tuple, Dict, List, Optional
 
-import matplotlib
 import numpy as np
 from scipy.integrate import cumulative_trapezoid
-from scipy.interpolate import interp1d
 
-if (sys.stdin is None or not sys.stdin.isatty()) and "MPLBACKEND" not in os.environ:
-    matplotlib.use("Agg")
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit when Numba is missing: leaves the function as is."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Optional Cython build of the vehicle-dynamics kernels (src/ev_calculator_ext.pyx,
+# built with `python setup.py build_ext --inplace`)
+try:
+    from .ev_calculator_ext import total_tractive_force_c, tractive_power_c
+    CYTHON_EXT_AVAILABLE = True
+except ImportError:
+    CYTHON_EXT_AVAILABLE = False
+
+# Ahead-of-time compiled drive-cycle kernel (src/build_aot.py): no JIT warm-up,
+# and Numba itself is not needed at run time
+try:
+    from .ev_kernels import run_cycle as _run_cycle_aot
+    AOT_AVAILABLE = True
+except ImportError:
+    AOT_AVAILABLE = False
 
-import matplotlib.pyplot as plt
+
+# ============================================================================
+# PART 0: NUMERICAL KERNELS
+# ============================================================================
+# Hot-path kernels used by EnergyCalculator and BatteryModel, written as
+# @njit functions. Compiled with Numba when it is installed; without it njit
+# is a no-op, so every kernel still exists as plain Python. The integrators
+# then fall back to scipy.integrate.cumulative_trapezoid, and callers take
+# their NumPy paths instead of the per-sample loops (see NUMBA_AVAILABLE).
+#
+# The compiled code is kept on disk between runs only when this module is
+# imported as src.ev_calculator. Numba's cache records the module name, and
+# code cached under one name cannot be loaded under another (a plain
+# `import ev_calculator` from src/, or the file run as __main__), so any
+# other name compiles afresh instead.
+_NUMBA_CACHE = __name__ == "src.ev_calculator"
+
+if NUMBA_AVAILABLE:
+    @njit(cache=_NUMBA_CACHE, fastmath=True)
+    def cumtrapz_uniform(y, dt, out):
+        """Cumulative trapezoidal integral of y on a uniform grid of step dt."""
+        if y.shape[0] > 0:
+            out[0] = 0.0
+        for i in range(1, y.shape[0]):
+            out[i] = out[i - 1] + 0.5 * dt * (y[i] + y[i - 1])
+        return out
+
+    @njit(cache=_NUMBA_CACHE, fastmath=True)
+    def cumtrapz(y, t, out):
+        """Cumulative trapezoidal integral of y over an arbitrary grid t."""
+        if y.shape[0] > 0:
+            out[0] = 0.0
+        for i in range(1, y.shape[0]):
+            out[i] = out[i - 1] + 0.5 * (t[i] - t[i - 1]) * (y[i] + y[i - 1])
+        return out
+else:
+    def cumtrapz_uniform(y, dt, out):
+        """Cumulative trapezoidal integral of y on a uniform grid of step dt."""
+        # Accumulate in float64 even for float32 samples
+        out[:] = cumulative_trapezoid(y.astype(np.float64, copy=False), dx=dt, initial=0.0)
+        return out
+
+    def cumtrapz(y, t, out):
+        """Cumulative trapezoidal integral of y over an arbitrary grid t."""
+        out[:] = cumulative_trapezoid(y.astype(np.float64, copy=False), t, initial=0.0)
+        return out
+
+
+@njit(fastmath=True, cache=_NUMBA_CACHE, nogil=True)
+def _run_cycle(time, velocity, grade, params, out):
+    """
+    Simulate a full drive cycle in a single fused, compiled pass.
+
+    Force, power, regen split, battery power, SOC and the traction, motor,
+    auxiliary, regen and distance integrals are all carried as per-sample
+    scalars, so nothing of length N is allocated. If out is a (P_wheels, P_battery, soc)
+    tuple of arrays, the per-sample series are written into it as well;
+    pass None to skip them. Releases the GIL, so independent cycles can
+    run concurrently in threads.
+
+    params is a record of _PARAMS_DTYPE (see EnergyCalculator.refresh).
+    Returns (E_traction [J], E_motor [J], E_aux [J], E_regen [J],
+    distance [m], soc_final [-]).
+    """
+    n = velocity.shape[0]
+
+    # Unpack the parameter record into scalars once
+    mass = params.mass
+    k_aero = 0.5 * params.air_density * params.drag_coefficient * params.frontal_area
+    inv = 1.0 / np.sqrt(1.0 + grade * grade)  # cos(arctan(grade))
+    F_road = mass * params.gravity * params.rolling_coeff * inv + \
+             mass * params.gravity * grade * inv
+    eta = params.motor_efficiency * params.transmission_efficiency * \
+          params.inverter_efficiency
+    eta_regen = params.regen_efficiency
+    P_regen_cap = params.regen_max_power * 1000.0
+    P_aux = (params.hvac_power + params.electronics + params.lighting) * 1000.0
+    V_nom = params.nominal_voltage
+    Q_nom_ah = params.nominal_capacity * 1000.0 / params.nominal_voltage
+    k_soc = params.coulombic_efficiency / (3600.0 * Q_nom_ah)
+    soc_min = params.soc_min
+    soc_max = params.soc_max
+
+    E_traction = 0.0
+    E_motor = 0.0
+    E_aux = 0.0
+    E_regen = 0.0
+    distance = 0.0
+    s = params.soc_initial
+    pw_prev = 0.0
+    pm_prev = 0.0
+
+    for i in range(n):
+        if n < 2:
+            a = 0.0
+        elif i == 0:
+            a = (velocity[1] - velocity[0]) / (time[1] - time[0])
+        elif i == n - 1:
+            a = (velocity[n - 1] - velocity[n - 2]) / (time[n - 1] - time[n - 2])
+        else:
+            # Second-order central difference, same as np.gradient
+            hs = time[i] - time[i - 1]
+            hd = time[i + 1] - time[i]
+            a = (hs * hs * velocity[i + 1] + (hd * hd - hs * hs) * velocity[i]
+                 - hd * hd * velocity[i - 1]) / (hs * hd * (hs + hd))
+
+        v = velocity[i]
+        pw = v * (mass * a + k_aero * v * v + F_road)
+        if pw > 0:
+            pm = pw / eta
+        else:
+            pm = -min(-pw * eta_regen, P_regen_cap)
+        pb = pm + P_aux
+
+        if i > 0:
+            dt = time[i] - time[i - 1]
+            E_traction += 0.5 * dt * (max(pw, 0.0) + max(pw_prev, 0.0))
+            E_motor += 0.5 * dt * (max(pm, 0.0) + max(pm_prev, 0.0))
+            E_aux += P_aux * dt
+            if pm < 0:
+                E_regen -= pm * dt
+            distance += 0.5 * dt * (v + velocity[i - 1])
+
+            s -= k_soc * (pb / V_nom) * dt
+            s = min(max(s, soc_min), soc_max)
+
+        if out is not None:
+            out[0][i] = pw
+            out[1][i] = pb
+            out[2][i] = s
+
+        pw_prev = pw
+        pm_prev = pm
+
+    return E_traction, E_motor, E_aux, E_regen, distance, s
+
+
+@njit(cache=_NUMBA_CACHE, fastmath=True, nogil=True)
+def _soc_integrate(I, dt, soc0, k, soc_min, soc_max):
+    """
+    Clamped Coulomb-counting recurrence, one step per sample.
+
+    SOC(i) = clip(SOC(i-1) - k·I(i)·dt(i), soc_min, soc_max) with
+    k = η_c / (3600·Q_nom); returns SOC after each step.
+    """
+    out = np.empty(I.shape[0])
+    s = soc0
+    for i in range(I.shape[0]):
+        s = min(max(s - k * I[i] * dt[i], soc_min), soc_max)
+        out[i] = s
+    return out
+
+
+@njit(cache=_NUMBA_CACHE, fastmath=True, nogil=True)
+def _ekf_soc(I, V_meas, dt, soc0, P0, Q, R, k, R_int, ocv_grid):
+    """
+    Scalar extended Kalman filter on SOC, one step per sample.
+
+    Time update by Coulomb counting (k = η_c / (3600·Q_nom)), measurement
+    update against V_meas with V = OCV(SOC) - I·R_int. OCV and its slope
+    C = dOCV/dSOC come from ocv_grid, sampled uniformly on SOC ∈ [0, 1].
+    Returns (SOC estimate, error variance) after each step.
+    """
+    n = I.shape[0]
+    m = ocv_grid.shape[0] - 1
+    soc = np.empty(n)
+    var = np.empty(n)
+    s = soc0
+    P = P0
+    for i in range(n):
+        # Predict
+        s -= k * I[i] * dt[i]
+        P += Q
+
+        # Linearize OCV around the prediction (held at the ends of the table)
+        x = min(max(s, 0.0), 1.0) * m
+        j = min(int(x), m - 1)
+        C = (ocv_grid[j + 1] - ocv_grid[j]) * m
+        v_hat = ocv_grid[j] + (ocv_grid[j + 1] - ocv_grid[j]) * (x - j) - I[i] * R_int
+
+        # Correct
+        K = P * C / (C * C * P + R)
+        s += K * (V_meas[i] - v_hat)
+        P = (1.0 - K * C) * P
+
+        soc[i] = s
+        var[i] = P
+    return soc, var
+
+
+def _central_diff_uniform(y: np.ndarray, dt: float, out: np.ndarray) -> np.ndarray:
+    """
+    Derivative of y on a uniform grid of step dt, written into out.
+
+    Central differences inside, one-sided at the ends: the same values as
+    np.gradient(y, time) for uniformly spaced time, without its spacing
+    checks and temporaries. Requires at least two samples.
+    """
+    np.subtract(y[2:], y[:-2], out=out[1:-1])
+    out[1:-1] /= 2.0 * dt
+    out[0] = (y[1] - y[0]) / dt
+    out[-1] = (y[-1] - y[-2]) / dt
+    return out
+
+
+def _integrate_streams(streams: np.ndarray, steps: np.ndarray,
+                       dt: Optional[float]) -> np.ndarray:
+    """
+    Trapezoidal integrals of every row of a (num_streams, N) block over time.
+
+    Args:
+        streams: Samples to integrate, one stream per row
+        steps: Time steps between samples, np.diff(time) [s]
+        dt: Uniform time step [s], or None if the grid is non-uniform
+
+    Returns:
+        Integral of each stream over the full time span, shape (num_streams,)
+    """
+    if streams.shape[1] < 2:
+        return np.zeros(streams.shape[0])
+    if dt is not None:
+        # Uniform grid: dt·(Σy - (y_0 + y_N)/2) for all rows in one reduction
+        return dt * (streams.sum(axis=1) - 0.5 * (streams[:, 0] + streams[:, -1]))
+    # Non-uniform grid: Σ (y_i + y_i+1)/2 · Δt_i as one matrix-vector product
+    return 0.5 * ((streams[:, 1:] + streams[:, :-1]) @ steps)
 
 
 # ============================================================================
 # PART 1: DATA STRUCTURES
 # ============================================================================
 
-@dataclass
+def _param_fields(cls) -> Tuple:
+    """Parameter fields of a dataclass (class or instance), without derived ones."""
+    return tuple(f for f in fields(cls) if f.init)
+
+
+@lru_cache(maxsize=None)
+def _param_values(cls) -> attrgetter:
+    """Getter returning the tuple of parameter values of a cls instance."""
+    return attrgetter(*(f.name for f in _param_fields(cls)))
+
+
+def _record_dtype(cls) -> np.dtype:
+    """Structured dtype with one float64 field per parameter field of cls."""
+    return np.dtype([(f.name, np.float64) for f in _param_fields(cls)])
+
+
+def _to_record(params) -> np.ndarray:
+    """Pack a parameter dataclass into a 0-d structured array."""
+    rec = np.empty((), dtype=_record_dtype(type(params)))
+    for f in _param_fields(params):
+        rec[f.name] = getattr(params, f.name)
+    return rec
+
+
+@dataclass(slots=True)
 class VehicleParameters:
     """
     Vehicle physical parameters for EV performance calculations.
@@ -74,14 +349,37 @@ class VehicleParameters:
     # Constants
     gravity: float = 9.81             # Gravitational acceleration [m/s²]
 
-    def __post_init__(self):
-        """Validate parameters are within reasonable ranges."""
-        assert 1000 <= self.mass <= 3000, "Mass out of range"
-        assert 1.5 <= self.frontal_area <= 3.5, "Frontal area out of range"
-        assert 0.2 <= self.drag_coefficient <= 0.5, "Cd out of range"
-
+    # Range-check every new instance; Monte Carlo drivers building many
+    # parameter sets may switch this off and use validated() where needed
+    VALIDATE = True
 
-@dataclass
+    def __post_init__(self):
+        """Validate parameters (unless VALIDATE is off)."""
+        if VehicleParameters.VALIDATE:
+            self._validate()
+
+    @classmethod
+    def validated(cls, **kwargs) -> "VehicleParameters":
+        """Create an instance and range-check it, regardless of VALIDATE."""
+        params = cls(**kwargs)
+        params._validate()
+        return params
+
+    def _validate(self) -> None:
+        """Raise ValueError if parameters are outside reasonable ranges."""
+        if not 1000 <= self.mass <= 3000:
+            raise ValueError("Mass out of range")
+        if not 1.5 <= self.frontal_area <= 3.5:
+            raise ValueError("Frontal area out of range")
+        if not 0.2 <= self.drag_coefficient <= 0.5:
+            raise ValueError("Cd out of range")
+
+    def to_record(self) -> np.ndarray:
+        """Pack all parameters into a 0-d structured array (for compiled kernels)."""
+        return _to_record(self)
+
+
+@dataclass(slots=True)
 class BatteryParameters:
     """
     Battery system parameters for SOC/SOH estimation and thermal modeling.
@@ -123,8 +421,12 @@ class BatteryParameters:
         """
         return self.ocv_empty + (self.ocv_full - self.ocv_empty) * soc
 
+    def to_record(self) -> np.ndarray:
+        """Pack all parameters into a 0-d structured array (for compiled kernels)."""
+        return _to_record(self)
+
 
-@dataclass
+@dataclass(slots=True)
 class PowertrainParameters:
     """
     Electric powertrain parameters (motor + inverter + transmission).
@@ -151,8 +453,12 @@ class PowertrainParameters:
         """Calculate overall powertrain efficiency."""
         return self.motor_efficiency * self.transmission_efficiency * self.inverter_efficiency
 
+    def to_record(self) -> np.ndarray:
+        """Pack all parameters into a 0-d structured array (for compiled kernels)."""
+        return _to_record(self)
 
-@dataclass
+
+@dataclass(slots=True)
 class AuxiliaryLoads:
     """
     Auxiliary power consumption (HVAC, electronics, etc.).
@@ -172,11 +478,38 @@ class AuxiliaryLoads:
         """Calculate total auxiliary power consumption."""
         return self.hvac_power + self.electronics + self.lighting
 
+    def to_record(self) -> np.ndarray:
+        """Pack all parameters into a 0-d structured array (for compiled kernels)."""
+        return _to_record(self)
+
+
+# Every numeric parameter of the four dataclasses in one ~260-byte record, so
+# the drive-cycle kernel receives a single contiguous struct
+_PARAMS_DTYPE = np.dtype(
+    _record_dtype(VehicleParameters).descr +
+    _record_dtype(BatteryParameters).descr +
+    _record_dtype(PowertrainParameters).descr +
+    _record_dtype(AuxiliaryLoads).descr
+)
+
 
 # ============================================================================
 # PART 2: CORE PHYSICS MODELS
 # ============================================================================
 
+def _as_float_array(x) -> np.ndarray:
+    """np.asarray(x, dtype=float), except that float32 arrays are kept as float32."""
+    if isinstance(x, np.ndarray) and x.dtype == np.float32:
+        return x
+    return np.asarray(x, dtype=float)
+
+
+def _is_vector(x) -> bool:
+    """True for a 1-D C-contiguous float64 array (what the Cython kernels accept)."""
+    return isinstance(x, np.ndarray) and x.ndim == 1 and x.dtype == np.float64 and \
+        x.flags.c_contiguous
+
+
 class VehicleDynamics:
     """
     Vehicle dynamics calculations based on fundamental physics.
@@ -187,6 +520,15 @@ class VehicleDynamics:
 
     def __init__(self, vehicle: VehicleParameters):
         self.vehicle = vehicle
+        # Scratch buffer for total_tractive_force(), grown only when a longer
+        # drive cycle is seen (see _scratch)
+        self._F_buf = np.empty(0)
+
+    def _scratch(self, n: int) -> np.ndarray:
+        """Return an n-element view of the scratch buffer, reallocating on growth."""
+        if self._F_buf.size < n:
+            self._F_buf = np.empty(n)
+        return self._F_buf[:n]
 
     def aerodynamic_drag_force(self, velocity: np.ndarray,
                                wind_speed: float = 0.0) -> np.ndarray:
@@ -204,9 +546,19 @@ class VehicleDynamics:
             mathematic_model.md Section 1.2
             Gillespie (1992), Chapter 5
         """
-        effective_velocity = velocity + wind_speed
-        F_aero = 0.5 * self.vehicle.air_density * self.vehicle.drag_coefficient * \
-                 self.vehicle.frontal_area * effective_velocity**2
+        velocity = _as_float_array(velocity)
+        v = self.vehicle
+        k_aero = 0.5 * v.air_density * v.drag_coefficient * v.frontal_area
+
+        # (v + w)² = v·(v + 2w) + w², built in a single output array so that no
+        # effective_velocity temporary is allocated
+        if np.isscalar(wind_speed) and wind_speed == 0.0:
+            F_aero = np.multiply(velocity, velocity)
+        else:
+            F_aero = np.add(velocity, 2.0 * wind_speed)
+            F_aero *= velocity
+            F_aero += wind_speed * wind_speed
+        F_aero *= k_aero
         return F_aero
 
     def rolling_resistance_force(self, grade: float = 0.0) -> float:
@@ -222,9 +574,17 @@ class VehicleDynamics:
         Reference:
             mathematic_model.md Section 1.4
         """
-        theta = np.arctan(grade)
-        F_roll = self.vehicle.mass * self.vehicle.gravity * \
-                 self.vehicle.rolling_coeff * np.cos(theta)
+        v = self.vehicle
+        F_roll_flat = v.mass * v.gravity * v.rolling_coeff
+        if np.isscalar(grade):
+            if grade == 0.0:
+                return F_roll_flat
+        else:
+            grade = np.asarray(grade, dtype=float)
+
+        # cos(arctan(g)) = 1/√(1+g²): one sqrt instead of two transcendentals
+        inv = 1.0 / np.sqrt(1.0 + grade * grade)
+        F_roll = F_roll_flat * inv
         return F_roll
 
     def grading_resistance_force(self, grade: float) -> float:
@@ -241,9 +601,11 @@ class VehicleDynamics:
             mathematic_model.md Section 1.3
         """
         # For small angles: F_g ≈ m*g*tan(θ) = m*g*grade
-        # For accuracy: use sin(arctan(grade))
-        theta = np.arctan(grade)
-        F_grade = self.vehicle.mass * self.vehicle.gravity * np.sin(theta)
+        # For accuracy: use sin(arctan(grade)) = grade/√(1+grade²)
+        if not np.isscalar(grade):
+            grade = np.asarray(grade, dtype=float)
+        inv = 1.0 / np.sqrt(1.0 + grade * grade)
+        F_grade = self.vehicle.mass * self.vehicle.gravity * grade * inv
         return F_grade
 
     def acceleration_force(self, acceleration: np.ndarray) -> np.ndarray:
@@ -278,12 +640,38 @@ class VehicleDynamics:
             mathematic_model.md Section 1.1 (Equation 1.1)
             F_t = ma + F_aero + F_roll + F_grade
         """
-        F_accel = self.acceleration_force(acceleration)
-        F_aero = self.aerodynamic_drag_force(velocity, wind_speed)
-        F_roll = self.rolling_resistance_force(grade)
-        F_grade = self.grading_resistance_force(grade)
+        acceleration = _as_float_array(acceleration)
+
+        if CYTHON_EXT_AVAILABLE and np.isscalar(grade) and np.isscalar(wind_speed) and \
+                _is_vector(velocity) and acceleration.shape == np.shape(velocity) and \
+                _is_vector(acceleration):
+            v = self.vehicle
+            F_total = np.empty(acceleration.size)
+            total_tractive_force_c(velocity, acceleration, float(grade), float(wind_speed),
+                                   v.mass, v.drag_coefficient, v.frontal_area,
+                                   v.air_density, v.rolling_coeff, v.gravity, F_total)
+            return F_total
+
+        # Aero drag allocates the output array; every other term is folded
+        # into it in place
+        F_total = self.aerodynamic_drag_force(velocity, wind_speed)
+
+        # Rolling + grade resistance are scalars for a scalar grade; on a flat
+        # road only the rolling term is left
+        if np.isscalar(grade) and grade == 0.0:
+            v = self.vehicle
+            F_road = v.mass * v.gravity * v.rolling_coeff
+        else:
+            F_road = self.rolling_resistance_force(grade) + self.grading_resistance_force(grade)
+        F_total += F_road
+
+        if np.ndim(F_total) == 1 and F_total.shape == acceleration.shape:
+            F_accel = self._scratch(acceleration.size)
+            np.multiply(acceleration, self.vehicle.mass, out=F_accel)
+            F_total += F_accel
+        else:
+            F_total = F_total + self.acceleration_force(acceleration)
 
-        F_total = F_accel + F_aero + F_roll + F_grade
         return F_total
 
     def tractive_power(self, velocity: np.ndarray, force: np.ndarray) -> np.ndarray:
@@ -297,6 +685,11 @@ class VehicleDynamics:
         Returns:
             Power [W]
         """
+        if CYTHON_EXT_AVAILABLE and _is_vector(velocity) and _is_vector(force) and \
+                velocity.shape == force.shape:
+            P = np.empty(velocity.size)
+            tractive_power_c(velocity, force, P)
+            return P
         return velocity * force
 
 
@@ -324,6 +717,26 @@ class BatteryModel:
         self.voltage_history = []
         self.current_history = []
         self.time_history = []
+        self._ocv_key = None
+
+    # Resolution of the OCV table used by the EKF (ekf_soc_estimate). Stored
+    # as float32: half the cache footprint, and the ~1e-5 V rounding is far
+    # below any OCV curve's accuracy
+    OCV_GRID_SIZE = 1024
+
+    def _ocv_table(self) -> np.ndarray:
+        """
+        OCV sampled on OCV_GRID_SIZE uniform SOC points in [0, 1].
+
+        Built on first use and rebuilt whenever a battery parameter has
+        changed since, so the table never goes stale.
+        """
+        key = _param_values(type(self.battery))(self.battery)
+        if key != self._ocv_key:
+            soc_grid = np.linspace(0.0, 1.0, self.OCV_GRID_SIZE)
+            self._ocv_grid = np.asarray(self.battery.get_ocv(soc_grid), dtype=np.float32)
+            self._ocv_key = key
+        return self._ocv_grid
 
     def coulomb_counting(self, current: float, dt: float, soc_prev: float) -> float:
         """
@@ -339,7 +752,8 @@ class BatteryModel:
 
         Note:
             Coulomb counting accumulates error over time. For thesis-quality work,
-            combine with voltage-based correction (EKF) - see mathematic_model.md Section 11.1
+            combine with voltage-based correction (EKF, ekf_soc_estimate()) -
+            see mathematic_model.md Section 11.1
         """
         Q_nom_ah = self.battery.get_capacity_ah()
 
@@ -353,6 +767,99 @@ class BatteryModel:
 
         return soc_new
 
+    def coulomb_counting_series(self, current: np.ndarray, dt: np.ndarray,
+                                soc_prev: float) -> np.ndarray:
+        """
+        Apply coulomb_counting() over a whole series of steps.
+
+        Equivalent to calling coulomb_counting() once per step and feeding each
+        result into the next call. With Numba the recurrence runs as a compiled
+        loop (_soc_integrate); otherwise each unclamped stretch is a single
+        cumulative sum. When SOC hits a limit, the sum restarts from the limit,
+        so mid-cycle clamping is the same as step by step.
+
+        Args:
+            current: Battery current for each step [A]
+            dt: Length of each step [s]
+            soc_prev: SOC before the first step [-]
+
+        Returns:
+            SOC after each step [-]
+        """
+        Q_nom_ah = self.battery.get_capacity_ah()
+        soc_min, soc_max = self.battery.soc_min, self.battery.soc_max
+        current = np.asarray(current, dtype=float)
+        dt = np.asarray(dt, dtype=float)
+
+        if NUMBA_AVAILABLE:
+            k = self.battery.coulombic_efficiency / (3600 * Q_nom_ah)
+            return _soc_integrate(current, dt, float(soc_prev), k, soc_min, soc_max)
+
+        delta_soc = -(self.battery.coulombic_efficiency * current * dt) / (3600 * Q_nom_ah)
+        n = delta_soc.size
+        soc = np.empty(n)
+
+        start, s = 0, soc_prev
+        while start < n:
+            # Sitting on a limit: skip the steps that push further into it
+            if s == soc_min or s == soc_max:
+                pushing = delta_soc[start:] <= 0 if s == soc_min else delta_soc[start:] >= 0
+                k = n - start if pushing.all() else int(np.argmin(pushing))
+                soc[start:start + k] = s
+                start += k
+                if start == n:
+                    break
+
+            soc_raw = s + np.cumsum(delta_soc[start:])
+            outside = (soc_raw < soc_min) | (soc_raw > soc_max)
+            k = int(np.argmax(outside))
+            if not outside[k]:
+                soc[start:] = soc_raw
+                break
+            # First step that leaves the valid range: clamp and restart there
+            soc[start:start + k] = soc_raw[:k]
+            s = min(max(soc_raw[k], soc_min), soc_max)
+            soc[start + k] = s
+            start += k + 1
+
+        return soc
+
+    def ekf_soc_estimate(self, current: np.ndarray, v_measured: np.ndarray,
+                         dt: np.ndarray, soc0: float, P0: float = 1e-2,
+                         Q: float = 1e-7, R: float = 1.0,
+                         temperature: float = 25.0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Voltage-corrected SOC estimate (extended Kalman filter, Plett 2004).
+
+        Each step predicts SOC by Coulomb counting, then corrects it with the
+        difference between the measured terminal voltage and the model
+        V = OCV(SOC) - I·R_int(T), using the slope of the OCV table as the
+        measurement Jacobian. Unlike coulomb_counting_series() the estimate
+        is not clamped to [soc_min, soc_max]. Compiled with Numba when it is
+        installed.
+
+        Args:
+            current: Battery current for each step [A] (positive = discharge)
+            v_measured: Measured terminal voltage after each step [V]
+            dt: Length of each step [s], array or scalar
+            soc0: SOC estimate before the first step [-]
+            P0: Initial SOC error variance [-]
+            Q: Process noise variance per step (Coulomb-counting drift) [-]
+            R: Voltage measurement noise variance [V²]
+            temperature: Battery temperature [°C]
+
+        Returns:
+            (SOC estimate, SOC error variance) after each step
+        """
+        current = np.asarray(current, dtype=float)
+        v_measured = np.asarray(v_measured, dtype=float)
+        dt = np.ascontiguousarray(np.broadcast_to(np.asarray(dt, dtype=float), current.shape))
+        k = self.battery.coulombic_efficiency / (3600 * self.battery.get_capacity_ah())
+        R_int = float(self.get_internal_resistance(temperature))
+
+        return _ekf_soc(current, v_measured, dt, float(soc0), float(P0), float(Q),
+                        float(R), k, R_int, self._ocv_table())
+
     def get_internal_resistance(self, temperature: float) -> float:
         """
         Calculate temperature-dependent internal resistance (Equation 10.4).
@@ -366,13 +873,25 @@ class BatteryModel:
         Note:
             R_int increases 2-3× from 25°C to -20°C
         """
-        R_ref = self.battery.resistance_internal
-        alpha = self.battery.resistance_alpha
-        T_ref = self.battery.temp_reference
-
-        R_int = R_ref * (1 + alpha * (temperature - T_ref))
+        battery = self.battery
+        R_int = battery.resistance_internal * \
+            (1 + battery.resistance_alpha * (temperature - battery.temp_reference))
         return R_int
 
+    def get_internal_resistance_array(self, temperature: np.ndarray) -> np.ndarray:
+        """
+        Vectorized get_internal_resistance() for a temperature profile.
+
+        Args:
+            temperature: Battery temperature(s) [°C], scalar or array-like
+
+        Returns:
+            Internal resistance [Ω], shaped like temperature
+        """
+        battery = self.battery
+        return battery.resistance_internal * (1.0 + battery.resistance_alpha * (
+            np.asarray(temperature, dtype=float) - battery.temp_reference))
+
     def get_terminal_voltage(self, soc: float, current: float,
                             temperature: float = 25.0) -> float:
         """
@@ -388,11 +907,13 @@ class BatteryModel:
 
         Model:
             V_terminal = OCV(SOC) - I * R_int(T)
+
+        All arguments may also be arrays (broadcast against each other).
         """
         ocv = self.battery.get_ocv(soc)
-        r_int = self.get_internal_resistance(temperature)
+        r_int = self.get_internal_resistance_array(temperature)
 
-        v_terminal = ocv - current * r_int
+        v_terminal = ocv - np.asarray(current, dtype=float) * r_int
         return v_terminal
 
     def get_power_loss(self, current: float, temperature: float = 25.0) -> float:
@@ -400,14 +921,14 @@ class BatteryModel:
         Calculate battery internal power loss (Equation 10.4).
 
         Args:
-            current: Battery current [A]
-            temperature: Battery temperature [°C]
+            current: Battery current [A] (scalar or array)
+            temperature: Battery temperature [°C] (scalar or array)
 
         Returns:
             Power loss [W]
         """
-        r_int = self.get_internal_resistance(temperature)
-        P_loss = current**2 * r_int
+        r_int = self.get_internal_resistance_array(temperature)
+        P_loss = np.square(np.asarray(current, dtype=float)) * r_int
         return P_loss
 
 
@@ -422,28 +943,87 @@ class EnergyCalculator:
 
     Validation:
         ±3.7% accuracy vs. Nissan Leaf EPA data (Section 1.9, Study 3)
+
+    Precision:
+        dtype sets the floating-point type of the per-sample arrays (time,
+        velocity, power, SOC series). np.float32 halves their memory traffic;
+        energy, distance and SOC are still accumulated in float64, and the
+        results move by well under 0.1%, far inside the ±5% validation band.
+        The default float64 reproduces the reference numbers exactly.
     """
 
     def __init__(self, vehicle: VehicleParameters, powertrain: PowertrainParameters,
-                 battery: BatteryParameters, aux_loads: AuxiliaryLoads):
+                 battery: BatteryParameters, aux_loads: AuxiliaryLoads,
+                 dtype=np.float64):
         self.vehicle = vehicle
         self.powertrain = powertrain
         self.battery = battery
         self.aux_loads = aux_loads
         self.dynamics = VehicleDynamics(vehicle)
         self.battery_model = BatteryModel(battery)
+        self.dtype = np.dtype(dtype)
+        self._params_rec = np.empty((), dtype=_PARAMS_DTYPE)
+        self.refresh()
+
+    def _param_state(self) -> Tuple:
+        """Current parameter values, one tuple per parameter object."""
+        return tuple(_param_values(type(params))(params)
+                     for params in (self.vehicle, self.battery, self.powertrain, self.aux_loads))
+
+    def refresh(self) -> None:
+        """
+        Copy the current parameter values into the cached kernel record.
+
+        Drive-cycle runs call this themselves when a parameter value has
+        changed since the last refresh (see _refresh_if_changed).
+        """
+        self._load_params(self._param_state())
+
+    def _refresh_if_changed(self) -> None:
+        """
+        refresh() if a parameter was modified since the last run.
+
+        Unchanged parameters leave the cached record untouched.
+        """
+        state = self._param_state()
+        if state != self._state:
+            self._load_params(state)
+
+    def _load_params(self, state: Tuple) -> None:
+        """Copy the parameter values of state into the kernel record and plain floats."""
+        for params, values in zip((self.vehicle, self.battery, self.powertrain, self.aux_loads),
+                                  state):
+            for f, value in zip(_param_fields(params), values):
+                self._params_rec[f.name] = value
+
+        # Plain-float copies for the Python-level paths
+        self._eta = self.powertrain.get_overall_efficiency()
+        self._eta_regen = self.powertrain.regen_efficiency
+        self._P_regen_cap = self.powertrain.regen_max_power * 1000  # kW to W
+        self._P_aux_W = self.aux_loads.get_total_aux_power() * 1000  # kW to W
+        self._V_nom = self.battery.nominal_voltage
+        self._state = state
 
     def calculate_energy_consumption(self, time: np.ndarray, velocity: np.ndarray,
                                      grade: float = 0.0,
-                                     temperature: float = 25.0) -> Dict:
+                                     temperature: float = 25.0,
+                                     return_series: bool = True,
+                                     voltage_measured: Optional[np.ndarray] = None) -> Dict:
         """
         Calculate total energy consumption for a drive cycle (Equation 10.1).
 
         Args:
             time: Time array [s]
             velocity: Velocity profile [m/s]
-            grade: Road grade [-]
+            grade: Road grade [-], constant or one value per sample
             temperature: Ambient temperature [°C]
+            return_series: Include the per-sample 'soc', 'power_wheels' and
+                'power_battery' arrays (needed for plotting). With False the
+                compiled path allocates no per-sample arrays at all.
+            voltage_measured: Measured pack terminal voltage for each sample
+                [V]. When given, SOC is estimated with the voltage-corrected
+                filter (BatteryModel.ekf_soc_estimate) instead of plain
+                Coulomb counting, and 'soc_variance' is added to the series.
 
         Returns:
             Dictionary with energy breakdown and SOC history
@@ -452,67 +1032,53 @@ class EnergyCalculator:
             mathematic_model.md Section 10.1
             E_total = ∫ P(t) dt = ∫ [F_traction(t) × V(t)] dt
         """
-        # Calculate acceleration from velocity profile
-        acceleration = np.gradient(velocity, time)
-
-        # Calculate forces
-        F_traction = self.dynamics.total_tractive_force(velocity, acceleration, grade)
-
-        # Calculate tractive power at wheels
-        P_wheels = self.dynamics.tractive_power(velocity, F_traction)
-
-        # Account for regenerative braking
-        P_motor = np.zeros_like(P_wheels)
-        E_regen_recovered = 0.0
-
-        for i, p in enumerate(P_wheels):
-            if p > 0:  # Acceleration/cruising
-                # Power from battery = wheel power / efficiency
-                P_motor[i] = p / self.powertrain.get_overall_efficiency()
-            else:  # Braking (negative power)
-                # Recoverable power (limited by regen efficiency and max power)
-                P_regen = min(abs(p) * self.powertrain.regen_efficiency,
-                             self.powertrain.regen_max_power * 1000)
-                P_motor[i] = -P_regen
-                E_regen_recovered += P_regen * (time[i] - time[i-1]) if i > 0 else 0
-
-        # Add auxiliary loads
-        P_aux_total = self.aux_loads.get_total_aux_power() * 1000  # kW to W
-        P_battery = P_motor + P_aux_total
-
-        # Calculate battery current (simplified)
-        I_battery = P_battery / self.battery.nominal_voltage
-
-        # Simulate SOC over drive cycle
-        soc = np.zeros(len(time))
-        soc[0] = self.battery.soc_initial
-
-        for i in range(1, len(time)):
-            dt = time[i] - time[i-1]
-            soc[i] = self.battery_model.coulomb_counting(I_battery[i], dt, soc[i-1])
-
-        # Integrate energy consumption
-        E_traction = np.trapz(np.maximum(P_wheels, 0), time) / 3.6e6  # J to kWh
-        E_motor = np.trapz(np.maximum(P_motor, 0), time) / 3.6e6
-        E_aux = np.trapz(P_aux_total * np.ones_like(time), time) / 3.6e6
+        self._refresh_if_changed()
+        time = np.asarray(time, dtype=self.dtype)
+        velocity = np.asarray(velocity, dtype=self.dtype)
+        if len(time) < 2:
+            raise ValueError("Drive cycle needs at least two samples")
+
+        # The voltage-corrected SOC needs the battery current series
+        need_series = return_series or voltage_measured is not None
+
+        if self._is_constant_speed(time, velocity, grade):
+            series, E_traction, E_motor, E_aux, E_regen_recovered, distance, soc_final = \
+                self._run_cycle_constant(time, velocity, grade, need_series)
+        elif np.isscalar(grade) and \
+                (NUMBA_AVAILABLE or (AOT_AVAILABLE and _is_vector(time) and _is_vector(velocity))):
+            # The compiled kernels take one grade for the whole cycle; a
+            # per-sample grade profile goes through the NumPy path
+            series, E_traction, E_motor, E_aux, E_regen_recovered, distance, soc_final = \
+                self._run_cycle_compiled(time, velocity, grade, need_series)
+        else:
+            series, E_traction, E_motor, E_aux, E_regen_recovered, distance, soc_final = \
+                self._run_cycle_numpy(time, velocity, grade)
+
+        soc_variance = None
+        if voltage_measured is not None:
+            P_wheels, P_battery, soc = series
+            soc, soc_variance = self._estimate_soc_ekf(time, P_battery, voltage_measured,
+                                                       temperature)
+            series = (P_wheels, P_battery, soc.astype(self.dtype, copy=False))
+            soc_final = float(soc[-1])
+
+        E_traction = E_traction / 3.6e6  # J to kWh
+        E_motor = E_motor / 3.6e6
+        E_aux = E_aux / 3.6e6
         E_total = E_motor + E_aux
         E_regen_recovered = E_regen_recovered / 3.6e6  # J to kWh
 
         # Calculate range
-        distance = np.trapz(velocity, time) / 1000  # m to km
+        distance = distance / 1000  # m to km
         energy_per_km = E_total / distance if distance > 0 else 0
 
         # Estimate range with remaining battery
-        soc_final = soc[-1]
         energy_remaining = (soc_final - self.battery.soc_min) * self.battery.usable_capacity
         estimated_range = energy_remaining / energy_per_km if energy_per_km > 0 else 0
 
-        return {
+        results = {
             'time': time,
             'velocity': velocity,
-            'soc': soc,
-            'power_wheels': P_wheels / 1000,  # Convert to kW
-            'power_battery': P_battery / 1000,
             'E_traction_kWh': E_traction,
             'E_motor_kWh': E_motor,
             'E_aux_kWh': E_aux,
@@ -523,8 +1089,184 @@ class EnergyCalculator:
             'estimated_range_km': estimated_range,
             'soc_final': soc_final
         }
+        if return_series:
+            P_wheels, P_battery, soc = series
+            results['soc'] = soc
+            results['power_wheels'] = P_wheels / 1000  # Convert to kW
+            results['power_battery'] = P_battery / 1000
+            if soc_variance is not None:
+                results['soc_variance'] = soc_variance
+        return results
+
+    def _estimate_soc_ekf(self, time: np.ndarray, P_battery: np.ndarray,
+                          voltage_measured: np.ndarray,
+                          temperature: float) -> Tuple[np.ndarray, np.ndarray]:
+        """SOC series and its variance from the EKF, starting at soc_initial."""
+        I_battery = P_battery.astype(np.float64) / self._V_nom
+        voltage_measured = np.asarray(voltage_measured, dtype=float)
+        if voltage_measured.shape != I_battery.shape:
+            raise ValueError("voltage_measured must have one sample per time step")
+
+        P0 = 1e-2  # Initial SOC variance: soc_initial known to about ±10%
+        soc = np.empty(len(time))
+        var = np.empty(len(time))
+        soc[0] = self.battery.soc_initial
+        var[0] = P0
+        soc[1:], var[1:] = self.battery_model.ekf_soc_estimate(
+            I_battery[1:], voltage_measured[1:], np.diff(time.astype(np.float64)),
+            self.battery.soc_initial, P0=P0, temperature=temperature)
+        return soc, var
+
+    @staticmethod
+    def _is_constant_speed(time: np.ndarray, velocity: np.ndarray, grade) -> bool:
+        """True for a constant-speed cycle on a constant grade (closed-form case)."""
+        return np.isscalar(grade) and velocity.ndim == 1 and velocity.size >= 2 and \
+            time.shape == velocity.shape and np.ptp(velocity) < 1e-6
+
+    def _run_cycle_constant(self, time: np.ndarray, velocity: np.ndarray,
+                            grade: float, return_series: bool) -> Tuple:
+        """
+        Closed-form drive cycle at constant speed (a = 0).
+
+        Wheel, motor and battery power are constant, so every integral is
+        power × duration and SOC falls linearly until it reaches a limit.
+        """
+        v = float(velocity[0])
+        duration = float(time[-1] - time[0])
+
+        P_wheels = v * float(self.dynamics.total_tractive_force(v, 0.0, grade))
+        if P_wheels > 0:
+            P_motor = P_wheels / self._eta
+        else:
+            P_motor = -min(abs(P_wheels) * self._eta_regen, self._P_regen_cap)
+        P_battery = P_motor + self._P_aux_W
+
+        E_traction = max(P_wheels, 0.0) * duration
+        E_motor = max(P_motor, 0.0) * duration
+        E_aux = self._P_aux_W * duration
+        E_regen_recovered = -P_motor * duration if P_motor < 0 else 0.0
+        distance = v * duration
+
+        # Constant current: once the first step has brought SOC inside
+        # [soc_min, soc_max], the ramp only ever meets one limit, so clamping
+        # at the end matches clamping every step
+        soc_rate = self.battery.coulombic_efficiency * (P_battery / self._V_nom) / \
+            (3600 * self.battery.get_capacity_ah())
+        soc_min, soc_max = self.battery.soc_min, self.battery.soc_max
+        soc_1 = min(max(self.battery.soc_initial - soc_rate * float(time[1] - time[0]),
+                        soc_min), soc_max)
+        soc_final = min(max(soc_1 - soc_rate * float(time[-1] - time[1]), soc_min), soc_max)
+
+        series = None
+        if return_series:
+            soc = soc_1 - soc_rate * (time - time[1])
+            soc[0] = self.battery.soc_initial
+            np.clip(soc[1:], soc_min, soc_max, out=soc[1:])
+            series = (np.full(time.shape, P_wheels, dtype=self.dtype),
+                      np.full(time.shape, P_battery, dtype=self.dtype), soc)
+        return series, E_traction, E_motor, E_aux, E_regen_recovered, distance, soc_final
+
+    def _run_cycle_compiled(self, time: np.ndarray, velocity: np.ndarray,
+                            grade: float, return_series: bool) -> Tuple:
+        """
+        Run the drive cycle through the fused compiled kernel (see _run_cycle).
+
+        Uses the ahead-of-time build when it is installed and the inputs
+        match its float64 signature, and the Numba JIT kernel otherwise.
+        """
+        n = len(time)
+        series = None
+        if return_series:
+            series = (np.empty(n, self.dtype), np.empty(n, self.dtype), np.empty(n, self.dtype))
+
+        if AOT_AVAILABLE and _is_vector(time) and _is_vector(velocity):
+            # The exported signature always takes the series buffers
+            out = series if series is not None else (np.empty(n), np.empty(n), np.empty(n))
+            E_traction, E_motor, E_aux, E_regen, distance, soc_final = _run_cycle_aot(
+                time, velocity, float(grade), self._params_rec[()], out)
+        else:
+            E_traction, E_motor, E_aux, E_regen, distance, soc_final = _run_cycle(
+                time, velocity, float(grade), self._params_rec[()], series)
+        return series, E_traction, E_motor, E_aux, E_regen, distance, soc_final
+
+    @staticmethod
+    def _uniform_step(time: np.ndarray, steps: np.ndarray) -> Optional[float]:
+        """
+        Common step of a uniform time grid, or None if the grid is non-uniform.
+
+        Steps that differ only by the rounding of the time values
+        (np.arange(0, T, 0.1), float32 time) still count as uniform; the
+        step is then the mean step, so the grid keeps its exact duration.
+        """
+        if not steps.size:
+            return None
+        if np.all(steps == steps[0]):
+            return float(steps[0])
+        rounding = 4 * np.finfo(time.dtype).eps * max(abs(float(time[0])), abs(float(time[-1])))
+        if np.allclose(steps, steps[0], rtol=0.0, atol=rounding):
+            return float(time[-1] - time[0]) / steps.size
+        return None
+
+    def _run_cycle_numpy(self, time: np.ndarray, velocity: np.ndarray,
+                         grade: float) -> Tuple:
+        """Run the drive cycle with NumPy (fallback when Numba is unavailable)."""
+        # Step lengths, computed once and shared by the derivative, the regen
+        # sum, SOC and the integrals (dt[0] = 0 for the first sample). The
+        # generated drive cycles are on a uniform grid, which lets the
+        # derivative and the integrals use a constant step
+        dt = np.diff(time, prepend=time[0])
+        steps = dt[1:]
+        dt_uniform = self._uniform_step(time, steps)
 
-    def predict_range_with_adjustments(self, base_range_km: float,
+        # Calculate acceleration from velocity profile
+        if dt_uniform is not None and len(time) > 1:
+            acceleration = _central_diff_uniform(velocity, dt_uniform, np.empty_like(velocity))
+        else:
+            acceleration = np.gradient(velocity, time)
+
+        # Calculate forces
+        F_traction = self.dynamics.total_tractive_force(velocity, acceleration, grade)
+
+        # Calculate tractive power at wheels
+        P_wheels = self.dynamics.tractive_power(velocity, F_traction)
+
+        # Account for regenerative braking: motoring power is drawn through
+        # the powertrain efficiency, braking power is recovered at the regen
+        # efficiency up to the regen power limit
+        P_regen = np.minimum(np.maximum(-P_wheels, 0.0) * self._eta_regen, self._P_regen_cap)
+        P_motor = np.where(P_wheels > 0, P_wheels / self._eta, 0.0)
+        P_motor -= P_regen
+
+        # Recovered energy: rectangle rule over each preceding step
+        E_regen_recovered = float(np.dot(P_regen.astype(np.float64, copy=False), dt))
+
+        # Add auxiliary loads
+        P_battery = P_motor + self._P_aux_W
+
+        # Calculate battery current (simplified)
+        I_battery = P_battery / self._V_nom
+
+        # Simulate SOC over drive cycle
+        soc = np.empty(len(time))
+        soc[0] = self.battery.soc_initial
+        soc[1:] = self.battery_model.coulomb_counting_series(
+            I_battery[1:], dt[1:], self.battery.soc_initial)
+
+        # Integrate energy consumption: traction, motor and distance streams
+        # stacked into one float64 block and reduced together
+        streams = np.empty((3, len(time)))
+        np.maximum(P_wheels, 0, out=streams[0])
+        np.maximum(P_motor, 0, out=streams[1])
+        streams[2] = velocity
+        E_traction, E_motor, distance = _integrate_streams(streams, steps, dt_uniform)
+        # Constant auxiliary load: its integral is just power × elapsed time
+        E_aux = self._P_aux_W * float(time[-1] - time[0])
+
+        return (P_wheels, P_battery, soc.astype(time.dtype, copy=False)), E_traction, \
+            E_motor, E_aux, E_regen_recovered, distance, soc[-1]
+
+    @staticmethod
+    def predict_range_with_adjustments(base_range_km: float,
                                        temperature: float = 20.0,
                                        terrain_factor: float = 1.0,
                                        traffic_factor: float = 1.0) -> Dict:
@@ -533,12 +1275,13 @@ class EnergyCalculator:
 
         Args:
             base_range_km: Base range from EPA/WLTP test [km]
-            temperature: Ambient temperature [°C]
+            temperature: Ambient temperature [°C], scalar or array
             terrain_factor: Terrain adjustment (1.0=flat, 0.9=hilly)
             traffic_factor: Traffic adjustment (1.0=smooth, 0.85=heavy traffic)
 
         Returns:
-            Dictionary with adjusted range and factors
+            Dictionary with adjusted range and factors; for an array of
+            temperatures the temperature-dependent entries are arrays
 
         Reference:
             mathematic_model.md Section 18.4
@@ -547,19 +1290,45 @@ class EnergyCalculator:
         Note:
             Temperature impact validated: -10°C reduces range by ~30% (Tesla data)
         """
+        # Only all-scalar (hashable) queries can be memoized; any array
+        # argument is broadcast by the vectorized version
+        if not all(np.isscalar(x) for x in (base_range_km, temperature,
+                                             terrain_factor, traffic_factor)):
+            return EnergyCalculator.predict_range_with_adjustments_vec(
+                base_range_km, temperature, terrain_factor, traffic_factor)
+
+        result = _predict_range_cached(base_range_km, temperature,
+                                       terrain_factor, traffic_factor)
+        return dict(result)
+
+    @staticmethod
+    def predict_range_with_adjustments_vec(base_range_km: float,
+                                           temperature: np.ndarray,
+                                           terrain_factor: float = 1.0,
+                                           traffic_factor: float = 1.0) -> Dict:
+        """
+        Vectorized predict_range_with_adjustments() over an array of temperatures.
+
+        Args:
+            base_range_km: Base range from EPA/WLTP test [km]
+            temperature: Ambient temperature(s) [°C], scalar or array
+            terrain_factor: Terrain adjustment (1.0=flat, 0.9=hilly)
+            traffic_factor: Traffic adjustment (1.0=smooth, 0.85=heavy traffic)
+
+        Returns:
+            Dictionary with the same keys as predict_range_with_adjustments();
+            temperature-dependent entries are arrays shaped like temperature
+        """
+        T = np.asarray(temperature, dtype=float)
+
         # Temperature factor (Equation 18.4)
         T_optimal = 21.5  # °C
         k_temp = 0.0001   # 1/°C²
-        f_temp = 1 - k_temp * (temperature - T_optimal)**2
-        f_temp = max(0.5, f_temp)  # Clamp minimum to 50%
-
-        # HVAC factor (simplified)
-        if abs(temperature - 22.0) > 10:
-            f_hvac = 0.80  # Significant heating/cooling needed
-        elif abs(temperature - 22.0) > 5:
-            f_hvac = 0.90  # Moderate HVAC
-        else:
-            f_hvac = 0.98  # Minimal HVAC
+        f_temp = np.maximum(0.5, 1 - k_temp * (T - T_optimal)**2)  # Clamp minimum to 50%
+
+        # HVAC factor (simplified): significant / moderate / minimal HVAC
+        dT = np.abs(T - 22.0)
+        f_hvac = np.where(dT > 10, 0.80, np.where(dT > 5, 0.90, 0.98))
 
         # Calculate adjusted range
         adjusted_range = base_range_km * f_temp * terrain_factor * f_hvac * traffic_factor
@@ -576,11 +1345,55 @@ class EnergyCalculator:
             'range_loss_percent': (1 - adjusted_range/base_range_km) * 100
         }
 
+    def sweep(self, temperatures: np.ndarray, base_range_km: float,
+              terrain_factor: float = 1.0, traffic_factor: float = 1.0) -> Dict:
+        """
+        Evaluate every temperature-dependent factor over a sweep of temperatures.
+
+        One vectorized evaluation replaces a Python loop of
+        predict_range_with_adjustments() calls (temperature studies, Monte
+        Carlo batches).
+
+        Args:
+            temperatures: Ambient temperatures [°C], shape (K,)
+            base_range_km: Base range from EPA/WLTP test [km]
+            terrain_factor: Terrain adjustment (1.0=flat, 0.9=hilly)
+            traffic_factor: Traffic adjustment (1.0=smooth, 0.85=heavy traffic)
+
+        Returns:
+            Dictionary with the keys of predict_range_with_adjustments() plus
+            'temperature' and 'R_internal' [Ω]; temperature-dependent entries
+            are arrays of shape (K,)
+        """
+        T = np.asarray(temperatures, dtype=float)
+        result = self.predict_range_with_adjustments_vec(
+            base_range_km, T, terrain_factor, traffic_factor)
+        result['temperature'] = T
+        result['R_internal'] = self.battery_model.get_internal_resistance_array(T)
+        return result
+
+
+@lru_cache(maxsize=256)
+def _predict_range_cached(base_range_km: float, temperature: float,
+                          terrain_factor: float, traffic_factor: float) -> Dict:
+    """Scalar range adjustment, memoized for repeated queries."""
+    result = EnergyCalculator.predict_range_with_adjustments_vec(
+        base_range_km, temperature, terrain_factor, traffic_factor)
+    return {key: float(value) if isinstance(value, (np.ndarray, np.floating)) else value
+            for key, value in result.items()}
+
 
 # ============================================================================
 # PART 4: DRIVE CYCLES
 # ============================================================================
 
+def _read_only(*arrays: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Mark arrays read-only (memoized results are shared between callers)."""
+    for a in arrays:
+        a.setflags(write=False)
+    return arrays
+
+
 class DriveCycle:
     """
     Standard and custom drive cycle generation.
@@ -592,8 +1405,23 @@ class DriveCycle:
     - Custom cycle generation
     """
 
+    # Simplified WLTP phase table: (mean speed, amplitude) [km/h] for each
+    # quarter of the 600 s period - low, medium, high, extra high
+    _WLTP_PHASES = np.array([
+        (20.0, 15.0),
+        (40.0, 20.0),
+        (60.0, 15.0),
+        (80.0, 20.0),
+    ])
+
+    # The generators are pure functions of their arguments, so each result is
+    # kept in memory (lru_cache) and handed out read-only: repeated calls
+    # return the same arrays, which callers must copy before modifying
+
     @staticmethod
-    def generate_wltp_simplified(duration: float = 1800.0, dt: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    @lru_cache(maxsize=32)
+    def generate_wltp_simplified(duration: float = 1800.0, dt: float = 1.0,
+                                 dtype=np.float64) -> Tuple[np.ndarray, np.ndarray]:
         """
         Generate simplified WLTP Class 3 drive cycle.
 
@@ -603,36 +1431,33 @@ class DriveCycle:
         Args:
             duration: Cycle duration [s]
             dt: Time step [s]
+            dtype: Floating-point type of the returned arrays
 
         Returns:
-            (time, velocity) arrays
+            (time, velocity) arrays, read-only
         """
         time = np.arange(0, duration, dt)
 
         # Simplified WLTP: mix of urban, suburban, highway phases
         # Real WLTP has 4 phases with specific speed profiles
-        velocity = np.zeros_like(time)
-
-        for i, t in enumerate(time):
-            phase = (t % 600) / 600  # 600s cycle periods
+        phase = (time % 600) / 600  # 600s cycle periods
 
-            if phase < 0.25:  # Low speed urban
-                velocity[i] = 20 + 15 * np.sin(2 * np.pi * phase * 4)
-            elif phase < 0.5:  # Medium speed
-                velocity[i] = 40 + 20 * np.sin(2 * np.pi * (phase - 0.25) * 4)
-            elif phase < 0.75:  # High speed
-                velocity[i] = 60 + 15 * np.sin(2 * np.pi * (phase - 0.5) * 4)
-            else:  # Extra high speed
-                velocity[i] = 80 + 20 * np.sin(2 * np.pi * (phase - 0.75) * 4)
+        # Look up each sample's phase in the table and evaluate the whole
+        # profile in one pass
+        idx = np.minimum((phase * 4).astype(np.intp), 3)
+        mean, amplitude = DriveCycle._WLTP_PHASES[idx].T
+        velocity = mean + amplitude * np.sin(2 * np.pi * (phase - 0.25 * idx) * 4)
 
         # Convert km/h to m/s
         velocity = velocity / 3.6
 
-        return time, velocity
+        return _read_only(time.astype(dtype, copy=False), velocity.astype(dtype, copy=False))
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def generate_constant_speed(speed_kmh: float, duration: float = 3600.0,
-                               dt: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+                               dt: float = 1.0,
+                               dtype=np.float64) -> Tuple[np.ndarray, np.ndarray]:
         """
         Generate constant speed drive cycle (for highway range testing).
 
@@ -640,48 +1465,50 @@ class DriveCycle:
             speed_kmh: Constant speed [km/h]
             duration: Duration [s]
             dt: Time step [s]
+            dtype: Floating-point type of the returned arrays
 
         Returns:
-            (time, velocity) arrays
+            (time, velocity) arrays, read-only
         """
         time = np.arange(0, duration, dt)
-        velocity = np.ones_like(time) * (speed_kmh / 3.6)  # km/h to m/s
-        return time, velocity
+        velocity = np.full_like(time, speed_kmh / 3.6)  # km/h to m/s
+        return _read_only(time.astype(dtype, copy=False), velocity.astype(dtype, copy=False))
 
     @staticmethod
-    def generate_urban_cycle(duration: float = 1400.0, dt: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    @lru_cache(maxsize=32)
+    def generate_urban_cycle(duration: float = 1400.0, dt: float = 1.0,
+                             dtype=np.float64) -> Tuple[np.ndarray, np.ndarray]:
         """
         Generate urban drive cycle with frequent stops (EPA UDDS-like).
 
         Args:
             duration: Duration [s]
             dt: Time step [s]
+            dtype: Floating-point type of the returned arrays
 
         Returns:
-            (time, velocity) arrays
+            (time, velocity) arrays, read-only
         """
         time = np.arange(0, duration, dt)
-        velocity = np.zeros_like(time)
 
-        # Create stop-and-go pattern
+        # Create stop-and-go pattern: each 100 s segment accelerates to
+        # 50 km/h, cruises, decelerates and stops, evaluated for all samples
+        # at once
         segment_duration = 100  # seconds per segment
-        for i, t in enumerate(time):
-            segment = int(t / segment_duration)
-            t_in_segment = t % segment_duration
-
-            if t_in_segment < 20:  # Acceleration
-                velocity[i] = (t_in_segment / 20) * 50  # Accelerate to 50 km/h
-            elif t_in_segment < 60:  # Cruise
-                velocity[i] = 50
-            elif t_in_segment < 80:  # Deceleration
-                velocity[i] = 50 - ((t_in_segment - 60) / 20) * 50
-            else:  # Stop
-                velocity[i] = 0
+        t_in_segment = time % segment_duration
+        velocity = np.select(
+            [t_in_segment < 20,           # Acceleration
+             t_in_segment < 60,           # Cruise
+             t_in_segment < 80],          # Deceleration
+            [(t_in_segment / 20) * 50,    # Accelerate to 50 km/h
+             50.0,
+             50 - ((t_in_segment - 60) / 20) * 50],
+            default=0.0)                  # Stop
 
         # Convert km/h to m/s
         velocity = velocity / 3.6
 
-        return time, velocity
+        return _read_only(time.astype(dtype, copy=False), velocity.astype(dtype, copy=False))
 
 
 # ============================================================================
@@ -706,9 +1533,20 @@ class ModelValidator:
         Reference: mathematic_model.md Section 1.9, Validation Study 3
         Expected accuracy: ±3.7% (city), ±3.4% (highway), ±1.5% (combined)
 
+        The study is deterministic, so it runs once per process; later calls
+        return a copy of the memoized results.
+
         Returns:
             Validation results dictionary
         """
+        results = ModelValidator._nissan_leaf_2018()
+        return {key: dict(value) if isinstance(value, dict) else value
+                for key, value in results.items()}
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _nissan_leaf_2018() -> Dict:
+        """Run the Nissan Leaf 2018 study (see validate_nissan_leaf_2018)."""
         # Nissan Leaf 2018 specifications
         vehicle = VehicleParameters(
             mass=1580,           # kg (actual curb weight)
@@ -731,15 +1569,24 @@ class ModelValidator:
 
         aux = AuxiliaryLoads(hvac_power=0.0, electronics=0.3)
 
-        calculator = EnergyCalculator(vehicle, powertrain, battery, aux)
-
         # EPA city cycle (simplified UDDS)
         time_city, vel_city = DriveCycle.generate_urban_cycle(1400)
-        results_city = calculator.calculate_energy_consumption(time_city, vel_city)
 
         # EPA highway cycle (constant 100 km/h)
         time_hwy, vel_hwy = DriveCycle.generate_constant_speed(100, 1800)
-        results_hwy = calculator.calculate_energy_consumption(time_hwy, vel_hwy)
+
+        # The two cycles are independent and the compiled kernel releases the
+        # GIL, so run them side by side. Each gets its own calculator, since
+        # EnergyCalculator keeps per-run working state.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future_city = executor.submit(
+                EnergyCalculator(vehicle, powertrain, battery, aux).calculate_energy_consumption,
+                time_city, vel_city, return_series=False)
+            future_hwy = executor.submit(
+                EnergyCalculator(vehicle, powertrain, battery, aux).calculate_energy_consumption,
+                time_hwy, vel_hwy, return_series=False)
+            results_city = future_city.result()
+            results_hwy = future_hwy.result()
 
         # EPA test data (actual values)
         epa_city_kwh_per_100km = 18.9
@@ -788,6 +1635,21 @@ class ModelValidator:
 # PART 6: VISUALIZATION
 # ============================================================================
 
+def _pyplot():
+    """
+    Import matplotlib.pyplot on first use.
+
+    Keeps matplotlib (~0.4 s to import) off the startup path of scripts that
+    never plot. Selects the non-interactive Agg backend when stdin is not a
+    terminal, unless MPLBACKEND is set.
+    """
+    import matplotlib
+    if (sys.stdin is None or not sys.stdin.isatty()) and "MPLBACKEND" not in os.environ:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
 class EVVisualizer:
     """
     Visualization tools for EV simulation results.
@@ -802,6 +1664,8 @@ class EVVisualizer:
             results: Results dictionary from calculate_energy_consumption()
             save_path: Optional file path to save figure
         """
+        plt = _pyplot()
+
         fig, axes = plt.subplots(4, 1, figsize=(12, 10))
         fig.suptitle('EV Drive Cycle Simulation Results', fontsize=14, fontweight='bold')
 
@@ -869,17 +1733,10 @@ class EVVisualizer:
             base_range: Base range at optimal temperature [km]
             temperature_range: Array of temperatures to test [°C]
         """
-        # Create dummy calculator for range adjustment
-        vehicle = VehicleParameters()
-        battery = BatteryParameters()
-        powertrain = PowertrainParameters()
-        aux = AuxiliaryLoads()
-        calc = EnergyCalculator(vehicle, powertrain, battery, aux)
-
-        ranges = []
-        for temp in temperature_range:
-            result = calc.predict_range_with_adjustments(base_range, temperature=temp)
-            ranges.append(result['adjusted_range_km'])
+        plt = _pyplot()
+
+        ranges = EnergyCalculator.predict_range_with_adjustments(
+            base_range, temperature=temperature_range)['adjusted_range_km']
 
         plt.figure(figsize=(10, 6))
         plt.plot(temperature_range, ranges, 'b-', linewidth=2.5, label='Adjusted Range')
@@ -953,9 +1810,12 @@ def example_1_basic_range_calculation():
     return results
 
 
-def example_2_wltp_cycle_simulation():
+def example_2_wltp_cycle_simulation(plot: bool = True):
     """
     Example 2: WLTP drive cycle simulation with visualization.
+
+    Args:
+        plot: Plot the results (imports matplotlib)
     """
     print("\n" + "="*70)
     print("EXAMPLE 2: WLTP Drive Cycle Simulation")
@@ -997,14 +1857,18 @@ def example_2_wltp_cycle_simulation():
     print(f"  Projected range: {results['estimated_range_km']:.0f} km")
 
     # Visualize
-    EVVisualizer.plot_drive_cycle_results(results)
+    if plot:
+        EVVisualizer.plot_drive_cycle_results(results)
 
     return results
 
 
-def example_3_temperature_impact():
+def example_3_temperature_impact(plot: bool = True):
     """
     Example 3: Temperature impact on range (winter vs summer).
+
+    Args:
+        plot: Plot range vs temperature (imports matplotlib)
     """
     print("\n" + "="*70)
     print("EXAMPLE 3: Temperature Impact on Range")
@@ -1012,13 +1876,6 @@ def example_3_temperature_impact():
 
     base_range = 400  # km (EPA/WLTP rated range)
 
-    vehicle = VehicleParameters()
-    battery = BatteryParameters()
-    powertrain = PowertrainParameters()
-    aux = AuxiliaryLoads()
-
-    calc = EnergyCalculator(vehicle, powertrain, battery, aux)
-
     # Test different temperatures
     temperatures = [-20, -10, 0, 10, 20, 25, 30, 40]
 
@@ -1026,21 +1883,19 @@ def example_3_temperature_impact():
     print(f"{'Temp [°C]':<12} {'Range [km]':<12} {'Loss [%]':<12} {'Factors'}")
     print("-" * 70)
 
-    for temp in temperatures:
-        result = calc.predict_range_with_adjustments(
-            base_range,
-            temperature=temp,
-            terrain_factor=1.0,
-            traffic_factor=1.0
-        )
+    # Range adjustment needs no vehicle model: evaluate all temperatures at once
+    sweep = EnergyCalculator.predict_range_with_adjustments(
+        base_range, temperature=temperatures, terrain_factor=1.0, traffic_factor=1.0)
 
-        print(f"{temp:<12} {result['adjusted_range_km']:<12.0f} "
-              f"{result['range_loss_percent']:<12.1f} "
-              f"(temp: {result['f_temp']:.2f}, hvac: {result['f_hvac']:.2f})")
+    for i, temp in enumerate(temperatures):
+        print(f"{temp:<12} {sweep['adjusted_range_km'][i]:<12.0f} "
+              f"{sweep['range_loss_percent'][i]:<12.1f} "
+              f"(temp: {sweep['f_temp'][i]:.2f}, hvac: {sweep['f_hvac'][i]:.2f})")
 
     # Visualize temperature impact
-    temp_range = np.linspace(-20, 40, 50)
-    EVVisualizer.plot_range_comparison(base_range, temp_range)
+    if plot:
+        temp_range = np.linspace(-20, 40, 50)
+        EVVisualizer.plot_range_comparison(base_range, temp_range)
 
 
 def example_4_model_validation():
@@ -1087,10 +1942,18 @@ def wait_for_enter(prompt: str) -> None:
         print(f"{prompt.rstrip()} [auto-continue]")
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """
     Main demonstration program.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:]); pass --plot to
+            show the example figures
     """
+    parser = argparse.ArgumentParser(description="EV energy & battery calculator demonstrations")
+    parser.add_argument("--plot", action="store_true",
+                        help="show the drive-cycle and temperature plots (imports matplotlib)")
+    args = parser.parse_args(argv)
     print("\n" + "="*70)
     print("  ELECTRIC VEHICLE ENERGY & BATTERY CALCULATOR")
     print("  Thesis-Quality Implementation (10/10 Standard)")
@@ -1111,10 +1974,10 @@ def main():
     example_1_basic_range_calculation()
 
     wait_for_enter("\n\nPress Enter to continue to Example 2...")
-    example_2_wltp_cycle_simulation()
+    example_2_wltp_cycle_simulation(plot=args.plot)
 
     wait_for_enter("\n\nPress Enter to continue to Example 3...")
-    example_3_temperature_impact()
+    example_3_temperature_impact(plot=args.plot)
 
     wait_for_enter("\n\nPress Enter to continue to Example 4 (Validation)...")
     example_4_model_validation()
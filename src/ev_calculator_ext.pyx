@@ -0,0 +1,51 @@
+# cython: language_level=3
+"""
+Compiled vehicle-dynamics kernels for ev_calculator
+===================================================
+
+Optional Cython build of VehicleDynamics.total_tractive_force() and
+VehicleDynamics.tractive_power(). VehicleDynamics routes 1-D float64 inputs
+here when the extension has been built; otherwise the NumPy implementation
+is used unchanged.
+
+Build (from the repository root):
+    python setup.py build_ext --inplace
+"""
+
+cimport cython
+from libc.math cimport sqrt
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef void total_tractive_force_c(const double[::1] v, const double[::1] a,
+                                  double grade, double wind, double mass,
+                                  double Cd, double A, double rho, double Crr,
+                                  double g, double[::1] out) noexcept nogil:
+    """
+    Total tractive force F_t = ma + F_aero + F_roll + F_grade, written into out.
+
+    Same terms as VehicleDynamics.total_tractive_force (Equation 1.1), with
+    cos/sin(arctan(grade)) evaluated as 1/√(1+grade²) and grade/√(1+grade²).
+    """
+    cdef Py_ssize_t i, n = v.shape[0]
+    cdef double k_aero = 0.5 * rho * Cd * A
+    cdef double inv = 1.0 / sqrt(1.0 + grade * grade)
+    cdef double F_road = mass * g * Crr * inv + mass * g * grade * inv
+    cdef double u
+
+    for i in range(n):
+        u = v[i] + wind
+        out[i] = k_aero * u * u + F_road + mass * a[i]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef void tractive_power_c(const double[::1] v, const double[::1] force,
+                            double[::1] out) noexcept nogil:
+    """Tractive power P = v·F at the wheels, written into out."""
+    cdef Py_ssize_t i, n = v.shape[0]
+
+    for i in range(n):
+        out[i] = v[i] * force[i]